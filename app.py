@@ -1,10 +1,55 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import plotly.graph_objects as go
 from pathlib import Path
 from typing import Optional
 import os
+import re
+
+# Footnote markers such as " [1]" in the source data
+_FOOTNOTE_PATTERN = re.compile(r'\s*\[\d+\]')
+
+# Seed for the bubble jitter so layouts are stable across reruns
+_JITTER_SEED = 42
+
+# Bubble figures are cached server-wide and every shortlist toggle creates a new
+# key, so keep only the most recent figures
+_FIGURE_CACHE_MAX_ENTRIES = 64
+
+# Shared Plotly styling for the bubble charts
+_BUBBLE_MARKER = dict(
+    size=15,
+    line=dict(width=1, color='white'),
+    opacity=0.7,
+    color='#1f77b4'
+)
+
+_BUBBLE_TEXTFONT = dict(
+    size=9,
+    color='black',
+    family='Arial, sans-serif'
+)
+
+_BUBBLE_HOVERTEMPLATE = (
+    '<b>%{customdata[0]}</b><br>'
+    'Type: %{customdata[1]}<br>'
+    'Location: %{customdata[2]}<br>'
+    'Industry: %{customdata[3]}<br>'
+    'Number of Employees: %{customdata[4]}'
+    '<extra></extra>'
+)
+
+_BASE_LAYOUT = dict(
+    yaxis=dict(
+        visible=False,
+        range=[-3.5, 3.5]
+    ),
+    showlegend=False,
+    hovermode='closest',
+    plot_bgcolor='rgba(240, 242, 246, 0.5)',
+    margin=dict(l=20, r=20, t=60, b=80)
+)
 
 
 def add_umami_analytics():
@@ -38,38 +83,94 @@ def add_umami_analytics():
     )
 
 
-def load_company_data(file_path: str) -> Optional[pd.DataFrame]:
+class _MissingColumnsError(ValueError):
+    """Raised when the company CSV lacks columns the app needs."""
+
+
+@st.cache_data(show_spinner=False)
+def _read_company_data(file_path: str, modified_time: float) -> pd.DataFrame:
     """
-    Load and validate company data from CSV file.
+    Read the company CSV and derive the standardized employee band, industry
+    description and cleaned entity type columns.
+
+    Errors are raised rather than reported so that failed loads are not cached.
 
     Args:
         file_path: Path to the CSV file
+        modified_time: File modification time, so an edited CSV is reloaded
 
     Returns:
-        DataFrame containing company data, or None if loading fails
+        DataFrame containing company data
     """
-    try:
-        df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+
+    required_columns = [
+        'Entity_Legal_Name',
+        'Entity_Type',
+        'Headquarters_Location',
+        'Estimated_Employee_Band',
+        'Estimated_Employee_Band_Code',
+        'Primary_ANZSIC_Code'
+    ]
 
-        required_columns = [
-            'Entity_Legal_Name',
-            'Entity_Type',
-            'Headquarters_Location',
-            'Estimated_Employee_Band',
-            'Estimated_Employee_Band_Code',
-            'Primary_ANZSIC_Code'
-        ]
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise _MissingColumnsError(f"Missing required columns: {', '.join(missing_columns)}")
 
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            st.error(f"Missing required columns: {', '.join(missing_columns)}")
-            return None
+    df['Estimated_Employee_Band'] = df['Estimated_Employee_Band'].str.strip()
+    df['Entity_Type'] = df['Entity_Type'].str.strip()
+    df['Headquarters_Location'] = df['Headquarters_Location'].str.strip()
 
-        df['Estimated_Employee_Band'] = df['Estimated_Employee_Band'].str.strip()
-        df['Entity_Type'] = df['Entity_Type'].str.strip()
-        df['Headquarters_Location'] = df['Headquarters_Location'].str.strip()
+    band_order = create_employee_band_order()
+    # Map raw bands (e.g. "1–5 Employees [2]") to standard bands by their size prefix
+    band_prefixes = {standard_band.split()[0]: standard_band for standard_band in band_order}
+    band_mapping = {
+        unique_band: next(
+            (standard_band for prefix, standard_band in band_prefixes.items() if prefix in unique_band),
+            None
+        )
+        for unique_band in df['Estimated_Employee_Band'].dropna().unique()
+    }
+
+    df['Employee_Band_Standard'] = pd.Categorical(
+        df['Estimated_Employee_Band'].map(band_mapping), categories=band_order, ordered=True
+    )
 
-        return df
+    # Companies without a recognised band have no position on the charts, so leave them out
+    is_unmapped = df['Employee_Band_Standard'].isna()
+    if is_unmapped.any():
+        st.warning(f"Skipping {is_unmapped.sum()} companies with an unrecognised employee band")
+        df = df[~is_unmapped].reset_index(drop=True)
+
+    # Extract industry description from ANZSIC code (e.g., "K6411 (Financial Services)" -> "Financial Services")
+    df['Industry_Description'] = df['Primary_ANZSIC_Code'].str.extract(r'\((?P<industry>.*?)\)')['industry']
+    df['Industry_Description'] = df['Industry_Description'].fillna(df['Primary_ANZSIC_Code'])
+
+    # Clean up Entity_Type to remove [1], [2], [3] suffixes
+    df['Entity_Type_Clean'] = [
+        _FOOTNOTE_PATTERN.sub('', value) if isinstance(value, str) else value
+        for value in df['Entity_Type'].to_numpy()
+    ]
+
+    # Low-cardinality columns used for filtering and grouping
+    df['Headquarters_Location'] = df['Headquarters_Location'].astype('category')
+    df['Primary_ANZSIC_Code'] = df['Primary_ANZSIC_Code'].astype('category')
+
+    return df
+
+
+def load_company_data(file_path: str) -> Optional[pd.DataFrame]:
+    """
+    Load and validate company data from CSV file.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        DataFrame containing company data, or None if loading fails
+    """
+    try:
+        return _read_company_data(file_path, os.path.getmtime(file_path))
 
     except FileNotFoundError:
         st.error(f"File not found: {file_path}")
@@ -77,6 +178,9 @@ def load_company_data(file_path: str) -> Optional[pd.DataFrame]:
     except pd.errors.EmptyDataError:
         st.error("The CSV file is empty")
         return None
+    except _MissingColumnsError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return None
@@ -96,202 +200,160 @@ def create_employee_band_order():
     ]
 
 
-def create_bubble_chart(df: pd.DataFrame, chart_title: str = "", is_rejected: bool = False) -> None:
+def _compute_jitter(band_codes: np.ndarray) -> tuple:
     """
-    Create an interactive horizontal bubble chart showing companies by employee band.
+    Compute bubble offsets that spread companies around their band position.
 
     Args:
-        df: Filtered DataFrame containing company data
-        chart_title: Title to display above the chart
-        is_rejected: Whether this is the rejected companies chart
-    """
-    if df.empty:
-        if is_rejected:
-            st.info("All companies have been added to your shortlist! 🎉")
-        else:
-            st.info("Your shortlist is empty. Click on bubbles in the 'All Companies' chart below to add companies.")
-        return
-
-    if chart_title:
-        st.markdown(f"### {chart_title}")
-
-    band_order = create_employee_band_order()
+        band_codes: Employee band category code for each company, in plot order
 
-    df_plot = df.copy()
-    df_plot['Employee_Band_Clean'] = df_plot['Estimated_Employee_Band'].str.strip()
-
-    unique_bands = df_plot['Employee_Band_Clean'].unique()
-    band_mapping = {}
-    for unique_band in unique_bands:
-        for standard_band in band_order:
-            if standard_band.split()[0] in unique_band:
-                band_mapping[unique_band] = standard_band
-                break
-        if unique_band not in band_mapping:
-            band_mapping[unique_band] = unique_band
-
-    df_plot['Employee_Band_Standard'] = df_plot['Employee_Band_Clean'].map(band_mapping)
-
-    # Extract industry description from ANZSIC code (e.g., "K6411 (Financial Services)" -> "Financial Services")
-    df_plot['Industry_Description'] = df_plot['Primary_ANZSIC_Code'].str.extract(r'\((.*?)\)')[0]
-    df_plot['Industry_Description'] = df_plot['Industry_Description'].fillna(df_plot['Primary_ANZSIC_Code'])
-
-    # Clean up Entity_Type to remove [1], [2], [3] suffixes
-    df_plot['Entity_Type_Clean'] = df_plot['Entity_Type'].str.replace(r'\s*\[\d+\]', '', regex=True)
-
-    band_counts = df_plot.groupby('Employee_Band_Standard').size().reset_index(name='count')
-    df_plot = df_plot.merge(band_counts, on='Employee_Band_Standard', how='left')
-
-    np.random.seed(42)
-
-    df_plot['x_jitter'] = 0.0
-    df_plot['y_jitter'] = 0.0
+    Returns:
+        Tuple of (x_jitter, y_jitter) NumPy arrays
+    """
+    # Spread companies in each band around an ellipse, with a little random
+    # variation in angle and radius so bubbles don't sit on a perfect ring
+    jitter_strength_x = 0.45
+    jitter_strength_y = 2.5
+
+    codes = pd.Series(band_codes)
+    band_groups = codes.groupby(codes)
+    within_band_idx = band_groups.cumcount().to_numpy()
+    n_per_band = band_groups.transform('size').to_numpy()
+    n_total = len(codes)
+
+    # A fresh generator per call keeps the layout deterministic for the same band codes
+    rng = np.random.default_rng(_JITTER_SEED)
+    radius = rng.uniform(0.3, 1.0, size=n_total)
+    angle = within_band_idx * (2 * np.pi / n_per_band) + rng.uniform(-0.3, 0.3, size=n_total)
+
+    # Plain NumPy into preallocated arrays is all this needs. Numba is deliberately
+    # not used: it gives little over a few vectorized ops on this many rows and its
+    # JIT compile would add warm-up time to every cold start.
+    x_jitter = np.empty(n_total)
+    y_jitter = np.empty(n_total)
+    np.cos(angle, out=x_jitter)
+    np.sin(angle, out=y_jitter)
+    x_jitter *= radius
+    x_jitter *= jitter_strength_x
+    y_jitter *= radius
+    y_jitter *= jitter_strength_y
+
+    # A lone company sits in the centre of its band
+    is_single = n_per_band == 1
+    x_jitter[is_single] = 0.0
+    y_jitter[is_single] = 0.0
+
+    return x_jitter, y_jitter
+
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=_FIGURE_CACHE_MAX_ENTRIES,
+    hash_funcs={pd.DataFrame: lambda df: tuple(df['Entity_Legal_Name'])}
+)
+def _build_bubble_figure(df: pd.DataFrame, is_rejected: bool) -> go.Figure:
+    """
+    Build the bubble chart figure for a set of companies.
 
-    for band in band_order:
-        band_mask = df_plot['Employee_Band_Standard'] == band
-        band_indices = df_plot[band_mask].index
-        n_companies = len(band_indices)
+    Figures are cached by the companies on the chart, so reruns that show the
+    same companies reuse a recently built figure.
 
-        if n_companies == 0:
-            continue
+    Args:
+        df: Filtered DataFrame containing company data
+        is_rejected: Whether this is the rejected companies chart
 
-        jitter_strength_x = 0.45
-        jitter_strength_y = 2.5
+    Returns:
+        Plotly figure with one bubble per company, in the same order as df
+    """
+    band_order = create_employee_band_order()
 
-        if n_companies == 1:
-            x_jitter = [0]
-            y_jitter = [0]
-        else:
-            angle_step = 2 * np.pi / n_companies
-            radius_variation = np.random.uniform(0.3, 1.0, n_companies)
-
-            x_jitter = []
-            y_jitter = []
-            for i in range(n_companies):
-                angle = i * angle_step + np.random.uniform(-0.3, 0.3)
-                radius = radius_variation[i]
-
-                x_offset = radius * np.cos(angle) * jitter_strength_x
-                y_offset = radius * np.sin(angle) * jitter_strength_y
-
-                x_jitter.append(x_offset)
-                y_jitter.append(y_offset)
-
-        df_plot.loc[band_indices, 'x_jitter'] = x_jitter
-        df_plot.loc[band_indices, 'y_jitter'] = y_jitter
-
-    band_to_numeric = {band: idx for idx, band in enumerate(band_order)}
-    df_plot['x_numeric'] = df_plot['Employee_Band_Standard'].map(band_to_numeric)
-    df_plot['x_position'] = df_plot['x_numeric'] + df_plot['x_jitter']
-
-    fig = px.scatter(
-        df_plot,
-        x='x_position',
-        y='y_jitter',
-        text='Entity_Legal_Name' if not is_rejected else None,
-        hover_data={
-            'Entity_Legal_Name': True,
-            'Entity_Type_Clean': True,
-            'Headquarters_Location': True,
-            'Industry_Description': True,
-            'Employee_Band_Standard': True,
-            'x_position': False,
-            'y_jitter': False,
-            'x_jitter': False,
-            'x_numeric': False,
-            'count': False,
-            'Primary_ANZSIC_Code': False,
-            'Entity_Type': False
-        },
-        labels={
-            'x_position': 'Employee Band Size',
-            'y_jitter': '',
-            'Entity_Legal_Name': 'Company',
-            'Entity_Type_Clean': 'Type',
-            'Headquarters_Location': 'Location',
-            'Industry_Description': 'Industry',
-            'Employee_Band_Standard': 'Number of Employees'
-        },
-        title='',
-        height=200
-    )
+    band_codes = df['Employee_Band_Standard'].cat.codes.to_numpy()
+    x_jitter, y_jitter = _compute_jitter(band_codes)
 
+    # Shortlist chart shows company names on the bubbles, all companies chart does not
     if not is_rejected:
-        # Shortlist chart: show text on bubbles
-        fig.update_traces(
-            marker=dict(
-                size=15,
-                line=dict(width=1, color='white'),
-                opacity=0.7,
-                color='#1f77b4'
-            ),
+        text_style = dict(
+            mode='markers+text',
+            text=df['Entity_Legal_Name'].to_numpy(),
             textposition='middle center',
-            textfont=dict(
-                size=9,
-                color='black',
-                family='Arial, sans-serif'
-            )
+            textfont=_BUBBLE_TEXTFONT
         )
     else:
-        # All companies chart: no text on bubbles
-        fig.update_traces(
-            marker=dict(
-                size=15,
-                line=dict(width=1, color='white'),
-                opacity=0.7,
-                color='#1f77b4'
-            )
-        )
+        text_style = dict(mode='markers')
+
+    fig = go.Figure(go.Scatter(
+        x=band_codes + x_jitter,
+        y=y_jitter,
+        marker=_BUBBLE_MARKER,
+        customdata=df[[
+            'Entity_Legal_Name',
+            'Entity_Type_Clean',
+            'Headquarters_Location',
+            'Industry_Description',
+            'Employee_Band_Standard'
+        ]].to_numpy(),
+        hovertemplate=_BUBBLE_HOVERTEMPLATE,
+        **text_style
+    ))
 
     fig.update_layout(
+        **_BASE_LAYOUT,
         xaxis=dict(
             title='',
             tickmode='array',
-            tickvals=[band_to_numeric[band] for band in band_order],
+            tickvals=list(range(len(band_order))),
             ticktext=band_order,
             range=[-0.5, len(band_order) - 0.5]
         ),
-        yaxis=dict(
-            visible=False,
-            range=[-3.5, 3.5]
-        ),
-        showlegend=False,
-        hovermode='closest',
-        plot_bgcolor='rgba(240, 242, 246, 0.5)',
-        margin=dict(l=20, r=20, t=60, b=80)
+        height=200
     )
 
+    return fig
+
+
+def create_bubble_chart(df: pd.DataFrame, chart_title: str = "", is_rejected: bool = False) -> None:
+    """
+    Create an interactive horizontal bubble chart showing companies by employee band.
+
+    Args:
+        df: Filtered DataFrame containing company data
+        chart_title: Title to display above the chart
+        is_rejected: Whether this is the rejected companies chart
+    """
+    if df.empty:
+        if is_rejected:
+            st.info("All companies have been added to your shortlist! 🎉")
+        else:
+            st.info("Your shortlist is empty. Click on bubbles in the 'All Companies' chart below to add companies.")
+        return
+
+    if chart_title:
+        st.markdown(f"### {chart_title}")
+
+    fig = _build_bubble_figure(df, is_rejected)
+
     # Add click instruction for charts
     if not is_rejected:
         st.caption("💡 Click on any bubble to remove it from your shortlist")
     else:
         st.caption("💡 Click on any bubble to add it to your shortlist")
 
-    # Display the chart with click events
-    event = st.plotly_chart(fig, use_container_width=True, key=f"chart_{'all_companies' if is_rejected else 'shortlist'}", on_select="rerun")
+    chart_key = f"chart_{'all_companies' if is_rejected else 'shortlist'}"
 
-    # Handle click events
-    if event and hasattr(event, 'selection') and event.selection and 'points' in event.selection:
-        points = event.selection['points']
+    def handle_click():
+        """Update the shortlist before the enclosing fragment reruns."""
+        points = st.session_state[chart_key]['selection']['points']
         if points:
-            # Get the clicked company name
+            # Row labels of the loaded data double as shortlist mask positions
             clicked_idx = points[0]['point_index']
-            clicked_company = df_plot.iloc[clicked_idx]['Entity_Legal_Name']
+            company_idx = df.index[clicked_idx]
 
-            # Initialize session state if needed
-            if 'shortlisted_companies' not in st.session_state:
-                st.session_state.shortlisted_companies = set()
+            # Clicking in the all companies chart adds to the shortlist,
+            # clicking in the shortlist chart removes from it
+            st.session_state.shortlist_mask[company_idx] = is_rejected
 
-            # Toggle company shortlist status
-            if is_rejected:
-                # Move to shortlist (add to shortlisted set)
-                st.session_state.shortlisted_companies.add(clicked_company)
-            else:
-                # Remove from shortlist
-                if clicked_company in st.session_state.shortlisted_companies:
-                    st.session_state.shortlisted_companies.remove(clicked_company)
-
-            st.rerun()
+    # Display the chart with click events
+    st.plotly_chart(fig, use_container_width=True, key=chart_key, on_select=handle_click)
 
 
 def apply_filters(df: pd.DataFrame, locations: list,
@@ -308,33 +370,56 @@ def apply_filters(df: pd.DataFrame, locations: list,
     Returns:
         Filtered DataFrame
     """
-    filtered_df = df.copy()
-
-    band_order = create_employee_band_order()
-    filtered_df['Employee_Band_Clean'] = filtered_df['Estimated_Employee_Band'].str.strip()
-
-    unique_bands = filtered_df['Employee_Band_Clean'].unique()
-    band_mapping = {}
-    for unique_band in unique_bands:
-        for standard_band in band_order:
-            if standard_band.split()[0] in unique_band:
-                band_mapping[unique_band] = standard_band
-                break
-        if unique_band not in band_mapping:
-            band_mapping[unique_band] = unique_band
-
-    filtered_df['Employee_Band_Standard'] = filtered_df['Employee_Band_Clean'].map(band_mapping)
+    mask = np.ones(len(df), dtype=bool)
 
     if locations:
-        filtered_df = filtered_df[filtered_df['Headquarters_Location'].isin(locations)]
+        mask &= df['Headquarters_Location'].isin(locations).to_numpy()
 
     if employee_bands:
-        filtered_df = filtered_df[filtered_df['Employee_Band_Standard'].isin(employee_bands)]
+        mask &= df['Employee_Band_Standard'].isin(employee_bands).to_numpy()
 
     if anzsic_codes:
-        filtered_df = filtered_df[filtered_df['Primary_ANZSIC_Code'].isin(anzsic_codes)]
+        mask &= df['Primary_ANZSIC_Code'].isin(anzsic_codes).to_numpy()
+
+    return df.loc[mask]
+
+
+@st.fragment
+def render_charts(filtered_df: pd.DataFrame) -> None:
+    """
+    Render the shortlist and all companies charts.
+
+    Both charts live in one fragment so a bubble click reruns only the charts,
+    not the data loading and sidebar filters, while still moving the clicked
+    company from one chart to the other.
+
+    Args:
+        filtered_df: DataFrame after sidebar filters have been applied
+    """
+    # Split companies into shortlist and all companies, skipping the boolean
+    # indexing when every visible company falls on one side
+    shortlist_mask = st.session_state.shortlist_mask
+    if not shortlist_mask.any():
+        shortlist_df = filtered_df.iloc[:0]
+        all_companies_df = filtered_df
+    else:
+        is_shortlisted = shortlist_mask[filtered_df.index.to_numpy()]
+        if is_shortlisted.all():
+            shortlist_df = filtered_df
+            all_companies_df = filtered_df.iloc[:0]
+        else:
+            shortlist_df = filtered_df[is_shortlisted]
+            all_companies_df = filtered_df[~is_shortlisted]
+
+    # Display shortlist chart
+    shortlist_count = len(shortlist_df)
+    st.markdown(f"### 🎯 Your Shortlist ({shortlist_count} {('company' if shortlist_count == 1 else 'companies')})")
+    create_bubble_chart(shortlist_df, chart_title="", is_rejected=False)
 
-    return filtered_df
+    # Display all companies chart
+    all_count = len(all_companies_df)
+    st.markdown(f"### 📋 All Companies ({all_count} {('company' if all_count == 1 else 'companies')})")
+    create_bubble_chart(all_companies_df, chart_title="", is_rejected=True)
 
 
 def main():
@@ -378,9 +463,9 @@ def main():
 
     st.sidebar.markdown("Use the controls below to filter companies")
 
-    all_locations = sorted(df['Headquarters_Location'].unique().tolist())
+    all_locations = df['Headquarters_Location'].cat.categories.tolist()
     all_employee_bands = create_employee_band_order()
-    all_anzsic_codes = sorted(df['Primary_ANZSIC_Code'].unique().tolist())
+    all_anzsic_codes = df['Primary_ANZSIC_Code'].cat.categories.tolist()
 
     selected_locations = st.sidebar.multiselect(
         "Company Headquarters",
@@ -409,7 +494,7 @@ def main():
             st.rerun()
     with col2:
         if st.button("Clear Shortlist", type="secondary", use_container_width=True):
-            st.session_state.shortlisted_companies = set()
+            st.session_state.shortlist_mask = np.zeros(len(df), dtype=bool)
             st.rerun()
 
     filtered_df = apply_filters(
@@ -419,23 +504,12 @@ def main():
         selected_anzsic_codes
     )
 
-    # Initialize session state for shortlisted companies
-    if 'shortlisted_companies' not in st.session_state:
-        st.session_state.shortlisted_companies = set()
+    # Initialize session state for shortlisted companies (one flag per row of df),
+    # starting afresh if the data has been reloaded with a different number of rows
+    if 'shortlist_mask' not in st.session_state or len(st.session_state.shortlist_mask) != len(df):
+        st.session_state.shortlist_mask = np.zeros(len(df), dtype=bool)
 
-    # Split companies into shortlist and all companies
-    shortlist_df = filtered_df[filtered_df['Entity_Legal_Name'].isin(st.session_state.shortlisted_companies)]
-    all_companies_df = filtered_df[~filtered_df['Entity_Legal_Name'].isin(st.session_state.shortlisted_companies)]
-
-    # Display shortlist chart
-    shortlist_count = len(shortlist_df)
-    st.markdown(f"### 🎯 Your Shortlist ({shortlist_count} {('company' if shortlist_count == 1 else 'companies')})")
-    create_bubble_chart(shortlist_df, chart_title="", is_rejected=False)
-
-    # Display all companies chart
-    all_count = len(all_companies_df)
-    st.markdown(f"### 📋 All Companies ({all_count} {('company' if all_count == 1 else 'companies')})")
-    create_bubble_chart(all_companies_df, chart_title="", is_rejected=True)
+    render_charts(filtered_df)
 
     # Add analytics status indicator in footer (only on Streamlit Cloud)
     if os.getenv("STREAMLIT_SERVER_HEADLESS") == "true":